@@ -3,9 +3,59 @@ Utility script to augment `combined_artist_details_extended_with_categories_and_
 with the `record_label` column sourced from `data_with_labels.csv`, matched on artist ID.
 """
 
-import pandas as pd
+import sys
 from pathlib import Path
 
+import pandas as pd
+
+# Shared helpers live one directory up, next to the other analysis scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from text_csv import read_text_csv  # noqa: E402
+
+
+def _ensure_parquet(csv_path: Path) -> Path:
+    """Return a Parquet copy of `csv_path`, (re)writing it when missing or older than the CSV."""
+    parquet_path = csv_path.with_suffix(".parquet")
+    if not parquet_path.exists() or parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+        df = read_text_csv(csv_path)
+        df.to_parquet(parquet_path, compression="zstd", index=False)
+    return parquet_path
+
+
+def attach_record_labels(df_combined: pd.DataFrame, data_with_labels: Path) -> pd.DataFrame:
+    """Left-join `record_label` from `data_with_labels` onto `df_combined` by artist ID."""
+    # Reruns read the Parquet sibling instead of re-parsing the CSV.
+    # Only the ID and record_label are needed from the labels file; projecting at
+    # read time skips the unused columns and avoids accidental column overrides.
+    labels_parquet = _ensure_parquet(data_with_labels)
+    try:
+        df_labels = pd.read_parquet(
+            labels_parquet,
+            columns=["id.x", "record_label"],
+            dtype_backend="pyarrow",
+        )
+    except (KeyError, ValueError) as exc:
+        raise KeyError("Expected columns 'id.x' and 'record_label' not found in data_with_labels.csv") from exc
+
+    df_labels = df_labels.rename(columns={"id.x": "id"})
+
+    # Drop any stale record_label so the join yields a single column instead of
+    # clashing with the incoming one.
+    df_combined = df_combined.drop(columns="record_label", errors="ignore")
+
+    # Share one categorical dtype for the artist ID so the join hashes integer
+    # codes rather than 22-character Spotify ID strings. Missing IDs are left out
+    # of the categories, so they simply find no match.
+    id_dtype = pd.CategoricalDtype(pd.unique(pd.concat([df_labels["id"], df_combined["id"]]).dropna()))
+    df_labels["id"] = df_labels["id"].astype(id_dtype)
+    df_combined["id"] = df_combined["id"].astype(id_dtype)
+
+    # Index the labels by artist ID so the join probes that index directly.
+    df_labels = df_labels.set_index("id")
+
+    # Join, preserving all existing combined rows; record_label lands at the end.
+    return df_combined.join(df_labels, on="id", how="left")
+
 
 def main() -> None:
     root = Path(__file__).parent
@@ -17,28 +67,13 @@ def main() -> None:
     if not combined.exists():
         raise FileNotFoundError(f"Missing input file: {combined}")
 
-    df_labels = pd.read_csv(data_with_labels)
-    df_combined = pd.read_csv(combined)
-
-    # Align column names so we can merge on the artist ID.
-    if "id.x" not in df_labels.columns:
-        raise KeyError("Expected column 'id.x' not found in data_with_labels.csv")
-    df_labels = df_labels.rename(columns={"id.x": "id"})
-
-    # Keep only the ID and record_label to avoid accidental column overrides.
-    df_labels = df_labels[["id", "record_label"]]
-
-    # Merge, preserving all existing combined rows.
-    merged = df_combined.merge(df_labels, on="id", how="left")
-
-    # Reorder to keep record_label at the end for readability.
-    cols = [c for c in df_combined.columns if c != "record_label"]
-    if "record_label" in merged.columns:
-        cols.append("record_label")
-    merged = merged[cols]
+    df_combined = pd.read_parquet(_ensure_parquet(combined))
+    merged = attach_record_labels(df_combined, data_with_labels)
 
     output = root / "combined_artist_details_extended_with_categories_and_labels_with_labels.csv"
     merged.to_csv(output, index=False)
+    # The categorical ID is stored dictionary-encoded in the Parquet copy.
+    merged.to_parquet(output.with_suffix(".parquet"), compression="zstd", index=False)
 
     print(f"Augmented file written to: {output}")
     print(f"Rows: {len(merged):,}, Columns: {len(merged.columns)}")
@@ -0,0 +1,42 @@
+"""
+Single-pass build of the labelled artist table straight from
+`artistDetails/combined_artist_details_extended.csv`: detected categories are added
+in memory and `record_label` is joined from `data_with_labels.csv` before the only
+CSV write, instead of round-tripping through the intermediate category CSVs.
+
+Writes `labelled_artists.csv`, kept separate from `add_record_label.py`'s output
+because that script starts from the hand-edited intermediate CSV instead.
+"""
+
+import sys
+from pathlib import Path
+
+# Import the sibling steps as packages of the analysis directory, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from addLabelsToData.add_record_label import attach_record_labels  # noqa: E402
+from detectCategory.add_detected_category import add_detected_categories  # noqa: E402
+from text_csv import read_text_csv  # noqa: E402
+
+
+def main() -> None:
+    root = Path(__file__).parent
+    details = root.parent / "artistDetails" / "combined_artist_details_extended.csv"
+    data_with_labels = root / "data_with_labels.csv"
+
+    if not details.exists():
+        raise FileNotFoundError(f"Missing input file: {details}")
+    if not data_with_labels.exists():
+        raise FileNotFoundError(f"Missing input file: {data_with_labels}")
+
+    df_details = read_text_csv(details)
+    merged = attach_record_labels(add_detected_categories(df_details), data_with_labels)
+
+    output = root / "labelled_artists.csv"
+    merged.to_csv(output, index=False)
+
+    print(f"Labelled file written to: {output}")
+    print(f"Rows: {len(merged):,}, Columns: {len(merged.columns)}")
+
+
+if __name__ == "__main__":
+    main()
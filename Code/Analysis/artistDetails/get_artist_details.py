@@ -2,6 +2,12 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import csv
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared rate limiter lives one directory up, next to the other data-gathering scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spotify_ratelimit import MAX_WORKERS, api_call_with_backoff, ensure_access_token  # noqa: E402
 
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
@@ -28,66 +34,71 @@ with open("./combineArtists/combined_artists.csv", "r", encoding="utf-8") as f:
         artist_ids.append(artist_id)
         artist_data[artist_id] = {
             "name": row["name"],
-            "genres": row["genres"],
+            # Split once here; the set is merged with API genres per artist below
+            "genres": frozenset(g.strip() for g in (row["genres"] or "").split(",") if g.strip()),
             "user": row["user"]
         }
 
 print(f"Found {len(artist_ids)} artists in CSV")
 
-# Fetch artist details in batches of 50 (API limit)
-print("Fetching artist details from Spotify API...")
-all_artist_details = []
+def fetch_batch(batch):
+    """Fetch up to 50 artists with one /artists call, through the shared rate limiter."""
+    return api_call_with_backoff(sp.artists, batch)["artists"]
 
-for i in range(0, len(artist_ids), 50):
-    batch = artist_ids[i:i+50]
-    print(f"Fetching batch {i//50 + 1} ({len(batch)} artists)...")
-    
-    # Use the /artists endpoint to get multiple artists at once
-    results = sp.artists(batch)
-    
-    for artist in results["artists"]:
-        if artist:  # Check if artist data exists
-            artist_id = artist["id"]
+# Fetch artist details in batches of 50 (API limit), several batches in flight at
+# once, streaming each batch to a temp file that replaces the output CSV only
+# once every batch has succeeded (a failed run leaves the previous CSV intact)
+batches = [artist_ids[i:i+50] for i in range(0, len(artist_ids), 50)]
+print(f"Fetching artist details from Spotify API in {len(batches)} batches...")
+output_file = "combined_artist_details_extended.csv"
+saved_count = 0
 
-            api_genres = artist.get("genres", [])
-            
-            # Get genres from CSV (comma-separated string) and split into list
-            csv_genres_str = artist_data[artist_id]["genres"]
-            csv_genres = [g.strip() for g in csv_genres_str.split(",")] if csv_genres_str else []
-            
-            # Combine both lists (API genres first, then CSV genres) and remove duplicates
-            combined_genres = list(set(api_genres + csv_genres))
-            # Remove empty strings
-            combined_genres = [g for g in combined_genres if g]
-            # Sort for consistency
-            combined_genres.sort()
+# Authorise here, before the workers start, so only one OAuth callback server is ever bound
+ensure_access_token(sp)
+
+# Fixed sibling name opened with plain open(), so the output keeps the usual umask-derived mode
+tmp_path = output_file + ".tmp"
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+try:
+    with open(tmp_path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(["id", "name", "popularity", "followers", "genres", "user"])
+
+        # map() yields results in submission order, so rows keep the input order
+        for batch_num, artists in enumerate(executor.map(fetch_batch, batches), 1):
+            print(f"Fetched batch {batch_num}/{len(batches)} ({len(artists)} artists)")
             
-            # Convert back to comma-separated string for CSV output
-            genres_str = ", ".join(combined_genres)
-            all_artist_details.append({
-                "id": artist_id,
-                "name": artist["name"],
-                "popularity": artist["popularity"],
-                "followers": artist["followers"]["total"],
-                "genres": genres_str,  # Use genres from original CSV
-                "user": artist_data[artist_id]["user"]
-            })
+            rows = []
+            for artist in artists:
+                if artist:  # Check if artist data exists
+                    artist_id = artist["id"]
 
-# Write to new CSV file
-output_file = "combined_artist_details_extended.csv"
-with open(output_file, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["id", "name", "popularity", "followers", "genres", "user"])
-    
-    for artist in all_artist_details:
-        writer.writerow([
-            artist["id"],
-            artist["name"],
-            artist["popularity"],
-            artist["followers"],
-            artist["genres"],
-            artist["user"]
-        ])
+                    api_genres = artist.get("genres", [])
+                    
+                    # Union API genres with the pre-split CSV genres, sorted for consistency
+                    combined_genres = sorted(artist_data[artist_id]["genres"].union(api_genres))
+                    
+                    # Convert back to comma-separated string for CSV output
+                    genres_str = ", ".join(combined_genres)
+                    rows.append((
+                        artist_id,
+                        artist["name"],
+                        artist["popularity"],
+                        artist["followers"]["total"],
+                        genres_str,
+                        artist_data[artist_id]["user"]
+                    ))
 
-print(f"Saved {len(all_artist_details)} artists with extended details to {output_file}")
+            writer.writerows(rows)
+            saved_count += len(rows)
+    os.replace(tmp_path, output_file)
+except BaseException:
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    raise
+finally:
+    # map() submits every batch up front; if one failed, drop the ones not yet started
+    # rather than spending rate-limit budget on output that is being thrown away
+    executor.shutdown(cancel_futures=True)
 
+print(f"Saved {saved_count} artists with extended details to {output_file}")
@@ -1,115 +1,31 @@
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import csv
+import json
 import time
-from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 import numpy as np
+import pandas as pd
+import scipy.sparse as sparse
 import sys
+import tempfile
 from datetime import datetime
 import os
 
+# Shared rate limiter lives one directory up, next to the other data-gathering scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spotify_ratelimit import (  # noqa: E402
+    MAX_WORKERS,
+    api_call_with_backoff,
+    ensure_access_token,
+    get_rate_limit_status,
+    request_timestamps,
+)
+
 # Force unbuffered output so we see progress in real-time
 sys.stdout.reconfigure(line_buffering=True)
 
-# ============================================================
-# RATE LIMITING CONFIGURATION
-# ============================================================
-# Spotify's rate limit: Rolling 30-second window
-# Critical: No warning before 24-hour ban!
-# Conservative limit to stay safe
-RATE_LIMIT_WINDOW = 5.0  # seconds
-MAX_REQUESTS_PER_WINDOW = 20  # Conservative (actual limit ~20-25, but we stay safe)
-                               # Adjust this if you want to be more/less conservative
-                               # Recommended range: 15-20 (lower = safer but slower)
-
-# Track request timestamps in a rolling window
-request_timestamps = deque()
-
-def rate_limit_check():
-    """
-    Ensure we don't exceed Spotify's rate limit.
-    Uses a sliding window to track requests in the last 30 seconds.
-    Blocks until it's safe to make another request.
-    """
-    current_time = time.time()
-    
-    # Remove timestamps older than 30 seconds
-    while request_timestamps and current_time - request_timestamps[0] > RATE_LIMIT_WINDOW:
-        request_timestamps.popleft()
-    
-    # If we've hit the limit, wait until we can make another request
-    if len(request_timestamps) >= MAX_REQUESTS_PER_WINDOW:
-        # Calculate how long to wait
-        oldest_timestamp = request_timestamps[0]
-        time_to_wait = RATE_LIMIT_WINDOW - (current_time - oldest_timestamp) + 0.1  # Add 0.1s buffer
-        
-        if time_to_wait > 0:
-            print(f"  [RATE LIMIT] {len(request_timestamps)}/{MAX_REQUESTS_PER_WINDOW} requests in last 5s. Waiting {time_to_wait:.1f}s...", flush=True)
-            time.sleep(time_to_wait)
-            
-            # Clean up old timestamps after waiting
-            current_time = time.time()
-            while request_timestamps and current_time - request_timestamps[0] > RATE_LIMIT_WINDOW:
-                request_timestamps.popleft()
-    
-    # Record this request
-    request_timestamps.append(current_time)
-
-def get_rate_limit_status():
-    """Get current rate limiting status for display."""
-    current_time = time.time()
-    
-    # Count requests in last 30 seconds
-    count = 0
-    for timestamp in request_timestamps:
-        if current_time - timestamp <= RATE_LIMIT_WINDOW:
-            count += 1
-    
-    return count, MAX_REQUESTS_PER_WINDOW
-
-def api_call_with_backoff(func, *args, max_retries=5, initial_wait=2, **kwargs):
-    """
-    Execute API call with exponential backoff on rate limit errors.
-    Includes proactive rate limiting to prevent hitting Spotify's limits.
-    
-    Important: Spotify uses a rolling 30-second window with NO WARNING
-    before imposing a 24-hour ban. We enforce limits BEFORE making requests.
-    """
-    for attempt in range(max_retries):
-        try:
-            # PROACTIVE RATE LIMITING - Check before making request
-            rate_limit_check()
-            
-            # Make the API call
-            return func(*args, **kwargs)
-        except spotipy.exceptions.SpotifyException as e:
-            if e.http_status == 429:  # Rate limit error
-                # Check if Retry-After header is present
-                retry_after = e.headers.get('Retry-After')
-                if retry_after:
-                    wait_time = int(retry_after)
-                else:
-                    # Exponential backoff: 2, 4, 8, 16, 32 seconds
-                    wait_time = initial_wait * (2 ** attempt)
-                
-                print(f"\n⚠ Rate limit hit! Waiting {wait_time} seconds before retry (attempt {attempt + 1}/{max_retries})...", flush=True)
-                print(f"  Time: {datetime.now().strftime('%H:%M:%S')}", flush=True)
-                time.sleep(wait_time)
-            elif e.http_status >= 500:  # Server error
-                wait_time = initial_wait * (2 ** attempt)
-                print(f"\n⚠ Server error {e.http_status}. Waiting {wait_time} seconds before retry...", flush=True)
-                time.sleep(wait_time)
-            else:
-                # Non-retryable error, raise it
-                raise
-        except Exception as e:
-            # For other errors, use exponential backoff
-            wait_time = initial_wait * (2 ** attempt)
-            print(f"\n⚠ Error: {e}. Waiting {wait_time} seconds before retry (attempt {attempt + 1}/{max_retries})...", flush=True)
-            time.sleep(wait_time)
-    
-    raise Exception(f"Max retries ({max_retries}) exceeded for API call")
-
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 REDIRECT_URI = os.getenv("REDIRECT_URI", "http://127.0.0.1:8888/callback")
@@ -122,25 +38,108 @@ sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
     scope="user-top-read",
 ))
 
+# ============================================================
+# API RESPONSE CACHE
+# ============================================================
+# Album lists and track listings rarely change between runs, so they are cached
+# on disk per artist/album and reruns skip the API for them.
+# Entries older than CACHE_MAX_AGE are refetched so new releases show up.
+# Delete the cache directory to force a full refetch.
+CACHE_DIR = "cache"
+CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+# mkstemp files start out 0600; cache files get the mode a plain open() would give.
+# The umask can only be read by setting it, so do that once here, before any worker starts.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+CACHE_FILE_MODE = 0o666 & ~_UMASK
+
+def load_cached(kind, key):
+    """Return the cached JSON for cache/<kind>/<key>.json, or None on a miss or expired entry."""
+    path = os.path.join(CACHE_DIR, kind, f"{key}.json")
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) > CACHE_MAX_AGE:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cached(kind, key, data):
+    """Write data to cache/<kind>/<key>.json (atomically, so a crash never leaves a partial file)."""
+    path = os.path.join(CACHE_DIR, kind, f"{key}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique temp name, so two workers caching the same key can't clobber each other
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.chmod(tmp_path, CACHE_FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
 def load_artists_from_csv(filename):
     """Load artist data from CSV file."""
     artists = []
     artist_ids = set()
     
     with open(filename, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        # Plain csv.reader with column indices found once from the header,
+        # instead of building a dict for every row
+        reader = csv.reader(f)
+        header = next(reader)
+        name_idx, id_idx = header.index('name'), header.index('id')
         for row in reader:
-            # Skip empty rows
-            if not row.get('name') or not row.get('id'):
+            # Skip empty or short rows
+            if len(row) <= max(name_idx, id_idx) or not row[name_idx] or not row[id_idx]:
                 continue
             artists.append({
-                'name': row['name'],
-                'id': row['id']
+                'name': row[name_idx],
+                'id': row[id_idx]
             })
-            artist_ids.add(row['id'])
+            artist_ids.add(row[id_idx])
     
     return artists, artist_ids
 
+def fetch_artist_album_ids(artist):
+    """
+    Page through one artist's albums and singles.
+    Returns (album IDs, number of API calls made). On error, returns the
+    pages fetched so far. Complete lists are cached per artist.
+    """
+    cached = load_cached("albums", artist['id'])
+    if cached is not None:
+        return cached, 0
+    
+    album_ids = []
+    api_calls = 0
+    offset = 0
+    limit = 50
+    
+    try:
+        while True:
+            # Use backoff wrapper for API call
+            results = api_call_with_backoff(
+                sp.artist_albums,
+                artist['id'],
+                album_type='album,single',
+                limit=limit,
+                offset=offset
+            )
+            api_calls += 1
+            
+            album_ids.extend(album['id'] for album in results['items'])
+            
+            # Break if we got fewer items than requested (no more pages)
+            if len(results['items']) < limit:
+                break
+            offset += limit
+            
+    except Exception as e:
+        print(f"  ✗ Error getting albums for artist ID {artist['id']}: {e}", flush=True)
+    else:
+        save_cached("albums", artist['id'], album_ids)
+    
+    return album_ids, api_calls
+
 def get_all_album_ids(artists):
     """
     Step 1: Get all album IDs for all artists.
@@ -149,6 +148,8 @@ def get_all_album_ids(artists):
     Efficiency: ~100-150 API calls (1-2 per artist on average)
     - Most artists have <50 albums = 1 call
     - Prolific artists with >50 albums = 2+ calls with pagination
+    - Artists are fetched concurrently (MAX_WORKERS threads), so network
+      latency overlaps and the shared rate limiter becomes the only throttle
     """
     album_ids = set()
     total_artists = len(artists)
@@ -157,43 +158,85 @@ def get_all_album_ids(artists):
     print("\nStep 1: Fetching album lists for all artists...", flush=True)
     print(f"Progress: 0/{total_artists} artists processed", flush=True)
     
-    for idx, artist in enumerate(artists):
-        # Print progress every 10 artists
-        if (idx + 1) % 10 == 0 or idx == 0:
-            requests_in_window, max_requests = get_rate_limit_status()
-            print(f"Progress: {idx + 1}/{total_artists} artists | Albums: {len(album_ids)} | API calls: {api_calls} | Rate: {requests_in_window}/{max_requests} per 30s", flush=True)
+    # Authorise once here so the workers don't each start the OAuth flow
+    ensure_access_token(sp)
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(fetch_artist_album_ids, artist) for artist in artists]
         
-        try:
-            offset = 0
-            limit = 50
+        # Results are merged on the main thread, so album_ids needs no lock
+        for idx, future in enumerate(as_completed(futures)):
+            artist_album_ids, artist_api_calls = future.result()
+            album_ids.update(artist_album_ids)
+            api_calls += artist_api_calls
             
-            while True:
-                # Use backoff wrapper for API call
-                results = api_call_with_backoff(
-                    sp.artist_albums,
-                    artist['id'],
-                    album_type='album,single',
-                    limit=limit,
-                    offset=offset
-                )
-                api_calls += 1
-                
-                for album in results['items']:
-                    album_ids.add(album['id'])
-                
-                # Break if we got fewer items than requested (no more pages)
-                if len(results['items']) < limit:
-                    break
-                offset += limit
-                
-        except Exception as e:
-            print(f"  ✗ Error getting albums for artist ID {artist['id']}: {e}", flush=True)
-            continue
+            # Print progress every 10 artists
+            if (idx + 1) % 10 == 0 or idx == 0:
+                requests_in_window, max_requests = get_rate_limit_status()
+                print(f"Progress: {idx + 1}/{total_artists} artists | Albums: {len(album_ids)} | API calls: {api_calls} | Rate: {requests_in_window}/{max_requests} per 30s", flush=True)
     
     print(f"Progress: {total_artists}/{total_artists} artists processed", flush=True)
     print(f"Total API calls in Step 1: {api_calls}", flush=True)
     return list(album_ids)
 
+def fetch_album_batch(batch, batch_num):
+    """
+    Fetch one batch of up to 20 albums with their tracks.
+    Returns (tracks, number of API calls made). Each fully fetched album's
+    track list is cached.
+    """
+    tracks = []
+    api_calls = 0
+    
+    try:
+        # Get multiple albums at once - includes ALL track data!
+        results = api_call_with_backoff(sp.albums, batch)
+        api_calls += 1
+        
+        for album in results['albums']:
+            if album and 'tracks' in album:
+                # Extract all tracks from this album
+                # Most albums have <50 tracks, so they're fully included
+                album_tracks = list(album['tracks']['items'])
+                complete = True
+                
+                # For very long albums (rare), get remaining tracks
+                # The 'next' field indicates if there are more tracks
+                if album['tracks'].get('next'):
+                    album_id = album['id']
+                    album_name = album.get('name', 'Unknown')
+                    print(f"    → Album '{album_name}' has >50 tracks, fetching additional pages...", flush=True)
+                    offset = 50
+                    while True:
+                        try:
+                            more_results = api_call_with_backoff(
+                                sp.album_tracks,
+                                album_id,
+                                limit=50,
+                                offset=offset
+                            )
+                            api_calls += 1
+                            
+                            if not more_results or not more_results.get('items'):
+                                break
+                            album_tracks.extend(more_results['items'])
+                            if len(more_results['items']) < 50:
+                                break
+                            offset += 50
+                        except Exception as e:
+                            print(f"    ✗ Error fetching more tracks for album {album_id}: {e}", flush=True)
+                            complete = False
+                            break
+                
+                tracks.extend(album_tracks)
+                if complete:
+                    save_cached("tracks", album['id'], album_tracks)
+        
+    except Exception as e:
+        print(f"  ✗ Error fetching batch {batch_num}: {e}", flush=True)
+    
+    return tracks, api_calls
+
 def get_albums_with_tracks_batched(album_ids):
     """
     Step 2: Batch fetch albums with their tracks (up to 20 albums per call).
@@ -203,65 +246,46 @@ def get_albums_with_tracks_batched(album_ids):
     - Main efficiency gain: 20 albums per call instead of 1
     - Reduced from ~400 calls to ~20 calls (95% reduction!)
     - Extra calls only for albums with >50 tracks (very rare)
+    - Batches are fetched concurrently (MAX_WORKERS threads) under the
+      shared rate limiter
     """
     all_tracks = []
-    total_albums = len(album_ids)
     batch_size = 20  # Spotify allows up to 20 albums per request
     api_calls = 0
     
-    print(f"\nStep 2: Fetching {total_albums} albums in batches of {batch_size}...", flush=True)
+    # Albums fetched on a previous run come straight from the cache
+    uncached_album_ids = []
+    for album_id in album_ids:
+        cached = load_cached("tracks", album_id)
+        if cached is None:
+            uncached_album_ids.append(album_id)
+        else:
+            all_tracks.extend(cached)
+    print(f"\nStep 2: {len(album_ids) - len(uncached_album_ids)} albums loaded from cache ({len(all_tracks)} tracks)", flush=True)
+    album_ids = uncached_album_ids
+    total_albums = len(album_ids)
+    
+    print(f"Fetching {total_albums} albums in batches of {batch_size}...", flush=True)
     total_batches = (total_albums + batch_size - 1) // batch_size
     print(f"Total batches to process: {total_batches} (huge efficiency gain: {batch_size} albums per API call!)", flush=True)
     
-    for i in range(0, total_albums, batch_size):
-        batch = album_ids[i:i+batch_size]
-        batch_num = i // batch_size + 1
-        
-        requests_in_window, max_requests = get_rate_limit_status()
-        print(f"Batch {batch_num}/{total_batches} ({len(batch)} albums) | Tracks: {len(all_tracks)} | API calls: {api_calls} | Rate: {requests_in_window}/{max_requests}", flush=True)
+    # Authorise once here so the workers don't each start the OAuth flow
+    ensure_access_token(sp)
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(fetch_album_batch, album_ids[i:i+batch_size], i // batch_size + 1)
+            for i in range(0, total_albums, batch_size)
+        ]
         
-        try:
-            # Get multiple albums at once - includes ALL track data!
-            results = api_call_with_backoff(sp.albums, batch)
-            api_calls += 1
+        # Results are merged on the main thread, so all_tracks needs no lock
+        for done, future in enumerate(as_completed(futures), 1):
+            tracks, batch_api_calls = future.result()
+            all_tracks.extend(tracks)
+            api_calls += batch_api_calls
             
-            for album in results['albums']:
-                if album and 'tracks' in album:
-                    # Extract all tracks from this album
-                    # Most albums have <50 tracks, so they're fully included
-                    tracks = album['tracks']['items']
-                    all_tracks.extend(tracks)
-                    
-                    # For very long albums (rare), get remaining tracks
-                    # The 'next' field indicates if there are more tracks
-                    if album['tracks'].get('next'):
-                        album_id = album['id']
-                        album_name = album.get('name', 'Unknown')
-                        print(f"    → Album '{album_name}' has >50 tracks, fetching additional pages...", flush=True)
-                        offset = 50
-                        while True:
-                            try:
-                                more_results = api_call_with_backoff(
-                                    sp.album_tracks,
-                                    album_id,
-                                    limit=50,
-                                    offset=offset
-                                )
-                                api_calls += 1
-                                
-                                if not more_results or not more_results.get('items'):
-                                    break
-                                all_tracks.extend(more_results['items'])
-                                if len(more_results['items']) < 50:
-                                    break
-                                offset += 50
-                            except Exception as e:
-                                print(f"    ✗ Error fetching more tracks for album {album_id}: {e}", flush=True)
-                                break
-            
-        except Exception as e:
-            print(f"  ✗ Error fetching batch {batch_num}: {e}", flush=True)
-            continue
+            requests_in_window, max_requests = get_rate_limit_status()
+            print(f"Batch {done}/{total_batches} done | Tracks: {len(all_tracks)} | API calls: {api_calls} | Rate: {requests_in_window}/{max_requests}", flush=True)
     
     print(f"Completed: All {total_batches} batches processed", flush=True)
     print(f"Total API calls in Step 2: {api_calls}", flush=True)
@@ -271,69 +295,52 @@ def find_collaborations(all_tracks, artist_ids):
     """
     Step 3: Find all collaborations between artists in our list.
     Returns a dict mapping (artist_id1, artist_id2) -> list of track names.
-    """
-    collaborations = defaultdict(list)
-    processed_tracks = set()
     
+    Runs as a pandas pipeline: one (track, artist) row per credit, filtered to
+    our artists, self-joined on the track, then grouped by artist pair.
+    """
     print(f"\nStep 3: Analyzing {len(all_tracks)} tracks for collaborations...", flush=True)
     
-    total_tracks = len(all_tracks)
-    for idx, track in enumerate(all_tracks):
-        # Print progress every 1000 tracks
-        if (idx + 1) % 1000 == 0:
-            print(f"  Progress: {idx + 1}/{total_tracks} tracks analyzed, {len(collaborations)} collaboration pairs found", flush=True)
-        
-        if not track or 'id' not in track or track['id'] is None:
-            continue
-            
-        track_id = track['id']
-        
-        # Skip if we've already processed this track
-        if track_id in processed_tracks:
-            continue
-        
-        processed_tracks.add(track_id)
-        
-        # Get all artist IDs on this track
-        track_artist_ids = [a['id'] for a in track.get('artists', [])]
-        
-        # Find which of these artists are in our top 100 list
-        collaborating_artists = [aid for aid in track_artist_ids if aid in artist_ids]
-        
-        # If 2 or more of our artists are on this track, it's a collaboration
-        if len(collaborating_artists) >= 2:
-            track_name = track['name']
-            # Add all pairwise collaborations
-            for i in range(len(collaborating_artists)):
-                for j in range(i + 1, len(collaborating_artists)):
-                    artist1 = collaborating_artists[i]
-                    artist2 = collaborating_artists[j]
-                    # Store in sorted order to avoid duplicates
-                    pair = tuple(sorted([artist1, artist2]))
-                    collaborations[pair].append(track_name)
-    
-    print(f"  Completed: {total_tracks} tracks analyzed")
-    return collaborations
+    # Deduplicate tracks by ID up front (one hash per track), skipping empty entries
+    unique_tracks = {t['id']: t for t in all_tracks if t and t.get('id')}.values()
+    
+    credits = pd.DataFrame(
+        [(t['id'], a['id'], t['name']) for t in unique_tracks for a in t.get('artists', [])],
+        columns=['track_id', 'artist_id', 'track_name'],
+    )
+    
+    # Keep only artists in our top 100 list, once per track
+    credits = credits[credits['artist_id'].isin(list(artist_ids))].drop_duplicates(['track_id', 'artist_id'])
+    
+    # Pair up our artists that share a track; artist_id < artist_id_2 keeps each
+    # pair once, in sorted order
+    pairs = credits.merge(credits[['track_id', 'artist_id']], on='track_id', suffixes=('', '_2'))
+    pairs = pairs[pairs['artist_id'] < pairs['artist_id_2']]
+    
+    track_lists = pairs.groupby(['artist_id', 'artist_id_2'], sort=False)['track_name'].agg(list)
+    
+    print(f"  Completed: {len(unique_tracks)} tracks analyzed")
+    return dict(track_lists.items())
 
 def build_adjacency_matrix(artists, collaborations):
     """
     Build an adjacency matrix from the collaboration data.
-    Returns a numpy array where matrix[i][j] = 1 if artists i and j have collaborated.
+    Returns a symmetric scipy.sparse CSR matrix where matrix[i, j] = 1 if
+    artists i and j have collaborated. Memory scales with the number of
+    collaborations rather than n².
     """
     n = len(artists)
-    matrix = np.zeros((n, n), dtype=int)
     
     # Create a mapping from artist ID to index
     artist_id_to_idx = {artist['id']: idx for idx, artist in enumerate(artists)}
     
-    # Fill in the matrix
-    for (artist1_id, artist2_id), tracks in collaborations.items():
-        idx1 = artist_id_to_idx[artist1_id]
-        idx2 = artist_id_to_idx[artist2_id]
-        matrix[idx1][idx2] = 1
-        matrix[idx2][idx1] = 1  # Symmetric matrix
+    # One (row, col) entry per collaboration pair
+    rows = np.fromiter((artist_id_to_idx[a] for a, _ in collaborations), dtype=np.int32, count=len(collaborations))
+    cols = np.fromiter((artist_id_to_idx[b] for _, b in collaborations), dtype=np.int32, count=len(collaborations))
+    data = np.ones(len(rows), dtype=np.int8)
     
-    return matrix
+    matrix = sparse.coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()
+    return matrix + matrix.T  # Symmetric matrix
 
 def save_adjacency_matrix_for_r(matrix, artists, filename="collaboration_matrix.csv"):
     """
@@ -347,13 +354,13 @@ def save_adjacency_matrix_for_r(matrix, artists, filename="collaboration_matrix.
         header = [''] + [artist['name'] for artist in artists]
         writer.writerow(header)
         
-        # Write each row with artist name as first column
-        for idx, row in enumerate(matrix):
-            writer.writerow([artists[idx]['name']] + list(row))
+        # Write each row with artist name as first column, densifying one row at a time
+        for idx in range(matrix.shape[0]):
+            writer.writerow([artists[idx]['name']] + matrix[idx].toarray().ravel().tolist())
     
     print(f"\nAdjacency matrix saved to {filename}")
     print(f"Matrix shape: {matrix.shape}")
-    print(f"Total collaborations found: {np.sum(matrix) // 2}")  # Divide by 2 because symmetric
+    print(f"Total collaborations found: {matrix.nnz // 2}")  # Divide by 2 because symmetric
 
 def save_collaboration_details(collaborations, artists, filename="collaboration_details.csv"):
     """Save detailed information about each collaboration."""
@@ -364,7 +371,13 @@ def save_collaboration_details(collaborations, artists, filename="collaboration_
         writer = csv.writer(f)
         writer.writerow(['Artist 1', 'Artist 2', 'Number of Collaborations', 'Track Names'])
         
-        for (artist1_id, artist2_id), tracks in sorted(collaborations.items()):
+        # Sort the ID pairs as fixed-width strings in NumPy instead of sorting
+        # Python (pair, tracks) tuples, then stream rows in that order
+        # Width comes from the data, so an over-long ID can't be truncated and then missed
+        id_width = f"U{max(map(len, chain.from_iterable(collaborations)), default=1)}"
+        pairs = np.array(list(collaborations), dtype=[('a', id_width), ('b', id_width)])
+        for artist1_id, artist2_id in np.sort(pairs, order=['a', 'b']).tolist():
+            tracks = collaborations[(artist1_id, artist2_id)]
             artist1_name = id_to_name[artist1_id]
             artist2_name = id_to_name[artist2_id]
             track_list = '; '.join(tracks)
@@ -428,7 +441,7 @@ def main():
     print("\n" + "=" * 60, flush=True)
     print("Statistics:", flush=True)
     print("=" * 60, flush=True)
-    #total_collabs = np.sum(matrix) // 2
+    total_collabs = len(collaborations)  # Equals matrix.nnz // 2
     print(f"Total unique collaboration pairs: {total_collabs}", flush=True)
     print(f"Total tracks analyzed: {len(all_tracks)}", flush=True)
     print(f"Total albums fetched: {len(album_ids)}", flush=True)
@@ -440,7 +453,7 @@ def main():
     print(f"End time: {datetime.now().strftime('%H:%M:%S')}", flush=True)
     
     # Find artists with most collaborations
-    #collab_counts = np.sum(matrix, axis=1)
+    #collab_counts = np.asarray(matrix.sum(axis=1)).ravel()
     #top_collaborators_idx = np.argsort(collab_counts)[::-1][:10]
     
     #print("\nTop 10 most collaborative artists:", flush=True)
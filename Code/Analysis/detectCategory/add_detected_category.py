@@ -1,6 +1,13 @@
-import csv
+import os
 import sys
 
+import numpy as np
+import pandas as pd
+
+# Shared helpers live one directory up, next to the other analysis scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_csv import read_text_csv  # noqa: E402
+
 GENRE_MAP = {
     "Electronic": {
         "electroclash", "witch house", "new rave", "alternative dance",
@@ -65,6 +72,20 @@ GENRE_MAP = {
     }
 }
 
+# Inverted index: genre -> categories containing it, so each genre is a single lookup
+GENRE_TO_CATEGORIES = {
+    genre: frozenset(category for category, genre_set in GENRE_MAP.items() if genre in genre_set)
+    for genre in set().union(*GENRE_MAP.values())
+}
+
+# Bitmask encoding for bulk processing: bit k stands for CATEGORY_NAMES[k]. Names are
+# sorted, so reading bits low to high yields categories in sorted order.
+CATEGORY_NAMES = sorted(GENRE_MAP)
+GENRE_TO_MASK = {
+    genre: sum(1 << CATEGORY_NAMES.index(category) for category in categories)
+    for genre, categories in GENRE_TO_CATEGORIES.items()
+}
+
 def detect_categories(genres_str):
     """
     Detect categories for an artist based on their genres.
@@ -82,17 +103,48 @@ def detect_categories(genres_str):
     genres = [genre.strip().lower() for genre in genres_str.split(",")]
     
     # Find matching categories
-    detected_categories = set()
-    
-    for genre in genres:
-        for category, genre_set in GENRE_MAP.items():
-            if genre in genre_set:
-                detected_categories.add(category)
+    detected_categories = set().union(*(GENRE_TO_CATEGORIES.get(genre, ()) for genre in genres))
     
     # Return as comma-separated string, sorted for consistency
     return "; ".join(sorted(detected_categories))
 
 
+def add_detected_categories(df):
+    """
+    Add the 'detected category' column to a DataFrame with a 'genres' column.
+    
+    Genres are split and normalised column-wise with pandas, dictionary-encoded
+    to integer codes, and each artist's category bitmask is OR-ed together in
+    NumPy; only the distinct bitmasks are turned back into strings. The result
+    matches calling detect_categories() row by row.
+    
+    Args:
+        df: DataFrame of artists with comma-separated genre strings
+        
+    Returns:
+        The same DataFrame, with the column added
+    """
+    # One row per (artist, genre), labelled with the artist's row position
+    genres = df['genres'].fillna('').reset_index(drop=True).str.split(',').explode().str.strip().str.lower()
+    
+    # Encode genres as integer codes and look up each distinct genre's mask once;
+    # the trailing 0 is the mask for code -1 (missing)
+    codes, unique_genres = pd.factorize(genres)
+    code_to_mask = np.array([GENRE_TO_MASK.get(genre, 0) for genre in unique_genres] + [0], dtype=np.uint32)
+    
+    row_masks = np.zeros(len(df), dtype=np.uint32)
+    np.bitwise_or.at(row_masks, genres.index.to_numpy(), code_to_mask[codes])
+    
+    # Decode each distinct bitmask to its "; "-joined category names once
+    unique_masks, inverse = np.unique(row_masks, return_inverse=True)
+    mask_labels = np.array(
+        ["; ".join(name for bit, name in enumerate(CATEGORY_NAMES) if mask >> bit & 1) for mask in unique_masks],
+        dtype=object,
+    )
+    df['detected category'] = mask_labels[inverse]
+    return df
+
+
 def process_csv(input_file, output_file):
     """
     Process the CSV file and add the detected_category column.
@@ -101,22 +153,11 @@ def process_csv(input_file, output_file):
         input_file: Path to input CSV file
         output_file: Path to output CSV file
     """
-    with open(input_file, 'r', encoding='utf-8') as infile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames + ['detected category']
-        
-        rows = []
-        for row in reader:
-            genres = row.get('genres', '')
-            row['detected category'] = detect_categories(genres)
-            rows.append(row)
+    df = read_text_csv(input_file)
     
-    with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    add_detected_categories(df).to_csv(output_file, index=False)
     
-    print(f"Processed {len(rows)} artists")
+    print(f"Processed {len(df)} artists")
     print(f"Output written to {output_file}")
 
 
@@ -34,17 +34,18 @@ fetch_top("long_term")
 #2) if still less than 100, pad with artists from recently played
 if len(all_artists) < 100:
     recent = sp.current_user_recently_played(limit=50)
-    for item in recent["items"]:
-        track = item["track"]
-        for artist in track["artists"]:
-            # fetch full artist details (to get genres)
-            if artist["id"] not in all_artists:
-                full = sp.artist(artist["id"])
-                all_artists[artist["id"]] = full
-            if len(all_artists) >= 100:
-                break
-        if len(all_artists) >= 100:
-            break
+    # collect the new artist ids first (deduplicated, in play order) ...
+    missing_ids = list(dict.fromkeys(
+        artist["id"]
+        for item in recent["items"]
+        for artist in item["track"]["artists"]
+        if artist["id"] not in all_artists
+    ))[:100 - len(all_artists)]
+    # ... then fetch full artist details (to get genres), 50 per request
+    for i in range(0, len(missing_ids), 50):
+        for full in sp.artists(missing_ids[i:i+50])["artists"]:
+            if full:
+                all_artists[full["id"]] = full
 
 #3) turn into list and cut to 100 max
 artists_list = list(all_artists.values())[:100]
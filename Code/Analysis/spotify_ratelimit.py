@@ -0,0 +1,138 @@
+"""
+Shared Spotify API rate limiting for the data-gathering scripts.
+
+A thread-safe sliding-window limiter plus an exponential-backoff wrapper for
+spotipy calls, so concurrent workers in any script share one request budget.
+"""
+
+import spotipy
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+# ============================================================
+# RATE LIMITING CONFIGURATION
+# ============================================================
+# Spotify's rate limit: Rolling 30-second window
+# Critical: No warning before 24-hour ban!
+# Conservative limit to stay safe
+RATE_LIMIT_WINDOW = 5.0  # seconds
+MAX_REQUESTS_PER_WINDOW = 20  # Conservative (actual limit ~20-25, but we stay safe)
+                               # Adjust this if you want to be more/less conservative
+                               # Recommended range: 15-20 (lower = safer but slower)
+MAX_WORKERS = 8  # Concurrent API calls; the rate limiter above still caps throughput
+
+# Track request timestamps in a rolling window
+request_timestamps = deque()
+# Worker threads share the window, so every check/append happens under this lock
+rate_limit_lock = threading.Lock()
+# Set when any worker gets a 429: nobody sends again until this time (epoch seconds)
+blocked_until = 0.0
+
+def _prune(current_time):
+    """Drop timestamps that have left the window. Caller must hold rate_limit_lock."""
+    while request_timestamps and current_time - request_timestamps[0] > RATE_LIMIT_WINDOW:
+        request_timestamps.popleft()
+
+def rate_limit_check():
+    """
+    Ensure we don't exceed Spotify's rate limit.
+    Uses a sliding window to track requests in the last 30 seconds.
+    Blocks until it's safe to make another request.
+    Thread-safe: callers waiting on the window queue up behind the lock.
+    Also waits out any 429 cooldown recorded by block_requests_for().
+    """
+    with rate_limit_lock:
+        current_time = time.time()
+        
+        # Honour a Retry-After cooldown started by any worker, so one 429 pauses all traffic
+        if current_time < blocked_until:
+            time.sleep(blocked_until - current_time)
+            current_time = time.time()
+        
+        # Remove timestamps older than the window
+        _prune(current_time)
+        
+        # If we've hit the limit, wait until we can make another request
+        if len(request_timestamps) >= MAX_REQUESTS_PER_WINDOW:
+            # Calculate how long to wait
+            oldest_timestamp = request_timestamps[0]
+            time_to_wait = RATE_LIMIT_WINDOW - (current_time - oldest_timestamp) + 0.1  # Add 0.1s buffer
+            
+            if time_to_wait > 0:
+                print(f"  [RATE LIMIT] {len(request_timestamps)}/{MAX_REQUESTS_PER_WINDOW} requests in last 5s. Waiting {time_to_wait:.1f}s...", flush=True)
+                time.sleep(time_to_wait)
+                
+                # Clean up old timestamps after waiting
+                current_time = time.time()
+                _prune(current_time)
+        
+        # Record this request
+        request_timestamps.append(current_time)
+
+def block_requests_for(seconds):
+    """Hold back every worker's next request for `seconds` (a 429 cooldown)."""
+    global blocked_until
+    with rate_limit_lock:
+        blocked_until = max(blocked_until, time.time() + seconds)
+
+def get_rate_limit_status():
+    """Get current rate limiting status for display."""
+    # After pruning, the deque holds exactly the requests in the window
+    with rate_limit_lock:
+        _prune(time.time())
+        return len(request_timestamps), MAX_REQUESTS_PER_WINDOW
+
+def api_call_with_backoff(func, *args, max_retries=5, initial_wait=2, **kwargs):
+    """
+    Execute API call with exponential backoff on rate limit errors.
+    Includes proactive rate limiting to prevent hitting Spotify's limits.
+    
+    Important: Spotify uses a rolling 30-second window with NO WARNING
+    before imposing a 24-hour ban. We enforce limits BEFORE making requests.
+    """
+    for attempt in range(max_retries):
+        try:
+            # PROACTIVE RATE LIMITING - Check before making request
+            rate_limit_check()
+            
+            # Make the API call
+            return func(*args, **kwargs)
+        except spotipy.exceptions.SpotifyException as e:
+            if e.http_status == 429:  # Rate limit error
+                # Check if Retry-After header is present
+                retry_after = e.headers.get('Retry-After')
+                if retry_after:
+                    wait_time = int(retry_after)
+                else:
+                    # Exponential backoff: 2, 4, 8, 16, 32 seconds
+                    wait_time = initial_wait * (2 ** attempt)
+                
+                print(f"\n⚠ Rate limit hit! Waiting {wait_time} seconds before retry (attempt {attempt + 1}/{max_retries})...", flush=True)
+                print(f"  Time: {datetime.now().strftime('%H:%M:%S')}", flush=True)
+                # Shared cooldown: the retry below (and every other worker) waits in rate_limit_check()
+                block_requests_for(wait_time)
+            elif e.http_status >= 500:  # Server error
+                wait_time = initial_wait * (2 ** attempt)
+                print(f"\n⚠ Server error {e.http_status}. Waiting {wait_time} seconds before retry...", flush=True)
+                time.sleep(wait_time)
+            else:
+                # Non-retryable error, raise it
+                raise
+        except Exception as e:
+            # For other errors, use exponential backoff
+            wait_time = initial_wait * (2 ** attempt)
+            print(f"\n⚠ Error: {e}. Waiting {wait_time} seconds before retry (attempt {attempt + 1}/{max_retries})...", flush=True)
+            time.sleep(wait_time)
+    
+    raise Exception(f"Max retries ({max_retries}) exceeded for API call")
+
+def ensure_access_token(sp):
+    """
+    Fetch (or load the cached) OAuth token on the calling thread.
+    Call this before fanning out to worker threads: on a first run the OAuth
+    flow starts a local callback server, and concurrent workers would each try
+    to bind it.
+    """
+    sp.auth_manager.get_access_token(as_dict=False)
@@ -0,0 +1,13 @@
+"""
+Shared CSV reader for the artist-table scripts.
+
+Every column is read as text and literal values such as an artist named "None"
+are kept, so IDs, names and genre strings round-trip unchanged.
+"""
+
+import pandas as pd
+
+
+def read_text_csv(path):
+    """Read `path` with the pyarrow engine, every column as a string, no NA parsing."""
+    return pd.read_csv(path, engine="pyarrow", dtype=str, keep_default_na=False)